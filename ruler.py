@@ -3,23 +3,6 @@
 import sys
 import objc
 
-from AppKit import NSMenu, NSMenuItem, NSApp
-
-def install_app_menu(app_name: str):
-    menubar = NSMenu.alloc().init()
-
-    app_menu_item = NSMenuItem.alloc().init()
-    menubar.addItem_(app_menu_item)
-
-    app_menu = NSMenu.alloc().init()
-    quit_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(
-        f"Quit {app_name}", "terminate:", "q"
-    )
-    app_menu.addItem_(quit_item)
-
-    app_menu_item.setSubmenu_(app_menu)
-    NSApp.setMainMenu_(menubar)
-
 def _missing_pyobjc(msg: str) -> None:
     print(msg)
     print("\nInstall (pip):   python3 -m pip install pyobjc")
@@ -27,15 +10,18 @@ def _missing_pyobjc(msg: str) -> None:
     sys.exit(0)
 
 try:
-    from Foundation import NSObject, NSString, NSNotificationCenter
+    from Foundation import NSObject, NSAttributedString, NSDictionary, NSNotificationCenter
     from AppKit import (
         NSApp, NSApplication, NSApplicationActivationPolicyRegular,
         NSBackingStoreBuffered,
-        NSColor, NSBezierPath, NSFont,
+        NSColor, NSFont,
         NSFontAttributeName, NSForegroundColorAttributeName,
-        NSMakeRect, NSRectFill,
+        NSGraphicsContext,
+        NSMakeRect, NSRectFill, NSRectFillList,
+        NSMenu, NSMenuItem,
         NSScreen, NSView, NSWindow,
         NSWindowStyleMaskTitled, NSWindowStyleMaskClosable, NSWindowStyleMaskMiniaturizable,
+        NSViewLayerContentsRedrawOnSetNeedsDisplay,
         NSApplicationDidChangeScreenParametersNotification,
         NSWindowDidChangeScreenNotification,
     )
@@ -43,11 +29,26 @@ try:
         CGDisplayScreenSize,
         CGDisplayCopyDisplayMode,
         CGDisplayModeGetPixelWidth,
+        CGLayerCreateWithContext, CGLayerGetContext, CGContextDrawLayerAtPoint,
     )
-    from PyObjCTools import AppHelper
 except Exception as e:
     _missing_pyobjc(f"PyObjC not available in this Python environment ({e}).")
 
+def install_app_menu(app_name: str):
+    menubar = NSMenu.alloc().init()
+
+    app_menu_item = NSMenuItem.alloc().init()
+    menubar.addItem_(app_menu_item)
+
+    app_menu = NSMenu.alloc().init()
+    quit_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(
+        f"Quit {app_name}", "terminate:", "q"
+    )
+    app_menu.addItem_(quit_item)
+
+    app_menu_item.setSubmenu_(app_menu)
+    NSApp.setMainMenu_(menubar)
+
 # Fallback constants for 16-inch MacBook Pro (Liquid Retina XDR) if physical mm size cannot be read.
 FALLBACK_PPI = 254.0
 
@@ -62,6 +63,31 @@ TICK_SMALL_PT = 10.0
 TICK_MED_PT = 18.0
 TICK_LARGE_PT = 28.0
 
+# Text attributes never change; bridge them to NSDictionary once at import
+# instead of rebuilding (and re-bridging) Python dicts per cache rebuild.
+_LABEL_ATTRS = NSDictionary.dictionaryWithDictionary_({
+    NSFontAttributeName: NSFont.systemFontOfSize_(12.0),
+    NSForegroundColorAttributeName: NSColor.blackColor(),
+})
+_WARN_ATTRS = NSDictionary.dictionaryWithDictionary_({
+    NSFontAttributeName: NSFont.systemFontOfSize_(11.0),
+    NSForegroundColorAttributeName: NSColor.grayColor(),
+})
+
+# The cm label strings (0–15) are invariant, so shape them exactly once at
+# import; cache rebuilds only recompute their positions.
+_CM_LABELS = [
+    NSAttributedString.alloc().initWithString_attributes_(str(cm), _LABEL_ATTRS)
+    for cm in range((RULER_LENGTH_MM // 10) + 1)
+]
+
+# Display probing (CGDisplayScreenSize/CGDisplayCopyDisplayMode and the
+# backing conversion) involves IOKit round-trips; results are fixed for a
+# given (display, backing scale), so cache them and evict only when the
+# screen configuration actually changes.
+# (display_id, backing_scale) -> (pixels_per_mm, pixels_per_point, error_text)
+_DISPLAY_CACHE = {}
+
 
 class RulerView(NSView):
     def initWithFrame_(self, frame):
@@ -70,7 +96,18 @@ class RulerView(NSView):
         if self is None:
             return None
         self._points_per_mm = 5.0
+        self._pixels_per_point = 2.0
         self._error_text = None
+        self._prev_error_text = None
+        self._tick_rect_lists = None
+        self._baseline_rect = None
+        self._tick_xs = None
+        self._tick_heights = None
+        self._cached_labels = None
+        self._cached_warning = None
+        self._ruler_layer = None
+        self._content_w = MARGIN_PT * 2.0
+        self._last_content_w = None
         return self
 
     def isOpaque(self):
@@ -105,6 +142,18 @@ class RulerView(NSView):
         screen = win.screen() if (win is not None and win.screen() is not None) else NSScreen.mainScreen()
         display_id = self._display_id_for_screen(screen) if screen is not None else None
 
+        cache_key = None
+        if display_id is not None:
+            try:
+                cache_key = (display_id, float(screen.backingScaleFactor()))
+            except Exception:
+                cache_key = None
+
+        if cache_key is not None and cache_key in _DISPLAY_CACHE:
+            pixels_per_mm, pixels_per_point, self._error_text = _DISPLAY_CACHE[cache_key]
+            self._apply_metrics(win, pixels_per_mm, pixels_per_point)
+            return
+
         pixels_per_mm = None
         self._error_text = None
 
@@ -114,6 +163,10 @@ class RulerView(NSView):
                 mm_w = float(size_mm.width)
                 mode = CGDisplayCopyDisplayMode(display_id)
                 px_w = float(CGDisplayModeGetPixelWidth(mode))
+                # PyObjC owns CF objects returned under the Copy rule, so the
+                # CGDisplayModeRef is released as soon as this reference drops.
+                # Do not add CGDisplayModeRelease here — it would over-release.
+                del mode
 
                 if mm_w > 0.0 and px_w > 0.0:
                     pixels_per_mm = px_w / mm_w
@@ -134,69 +187,163 @@ class RulerView(NSView):
             pixels_per_point = 2.0
             self._error_text = (self._error_text or "") + " (Also fell back to pixels/point=2.0.)"
 
-        self._points_per_mm = pixels_per_mm / pixels_per_point
+        if cache_key is not None:
+            _DISPLAY_CACHE[cache_key] = (pixels_per_mm, pixels_per_point, self._error_text)
+
+        self._apply_metrics(win, pixels_per_mm, pixels_per_point)
+
+    def _apply_metrics(self, win, pixels_per_mm, pixels_per_point):
+        new_ppm = pixels_per_mm / pixels_per_point
+
+        # Redundant notifications are common (window moved within the same
+        # screen, repeated screen-params events); if nothing we draw from has
+        # changed, don't resize or repaint at all.
+        if self._tick_rect_lists is not None and abs(new_ppm - self._points_per_mm) < 1e-6:
+            if self._error_text == self._prev_error_text:
+                return
+            # Geometry is unchanged and only the warning toggled: refresh the
+            # warning cache and dirty just the warning band, not the ruler.
+            self._prev_error_text = self._error_text
+            self._rebuild_warning_cache()
+            self._ruler_layer = None
+            self.setNeedsDisplayInRect_(
+                NSMakeRect(0, CONTENT_H_PT - 20.0, self._content_w, 20.0)
+            )
+            return
+
+        self._points_per_mm = new_ppm
+        self._pixels_per_point = pixels_per_point
+        self._prev_error_text = self._error_text
 
         length_pt = RULER_LENGTH_MM * self._points_per_mm
         content_w = MARGIN_PT * 2.0 + length_pt
 
-        if win is not None:
+        self._rebuild_drawing_caches()
+
+        # setContentSize_ triggers layout and resize notifications even for a
+        # no-op size, so only call it when the width meaningfully changed.
+        if win is not None and (
+            self._last_content_w is None or abs(content_w - self._last_content_w) > 0.5
+        ):
             win.setContentSize_((content_w, CONTENT_H_PT))
+            self._last_content_w = content_w
         self.setNeedsDisplay_(True)
 
-    def drawRect_(self, dirtyRect):
-        NSColor.whiteColor().set()
-        NSRectFill(dirtyRect)
-
+    def _rebuild_drawing_caches(self):
+        # Tick geometry and label metrics only change with _points_per_mm, so
+        # build them once here instead of on every drawRect_.
+        self._ruler_layer = None
         length_pt = RULER_LENGTH_MM * self._points_per_mm
+        self._content_w = MARGIN_PT * 2.0 + length_pt
         x0 = MARGIN_PT
-        x1 = x0 + length_pt
         y0 = BASELINE_Y_PT
 
-        NSColor.blackColor().set()
-
-        path = NSBezierPath.bezierPath()
-        path.setLineWidth_(1.0)
-
-        # Baseline
-        path.moveToPoint_((x0, y0))
-        path.lineToPoint_((x1, y0))
-
-        # Ticks
-        for mm in range(0, RULER_LENGTH_MM + 1):
-            x = x0 + mm * self._points_per_mm
+        # Per-mm x coordinates and tick heights, computed in one pass and kept
+        # around for reuse (rect building below, dirty-range culling).
+        # Each x is snapped to the device pixel grid independently (from its
+        # exact position, so rounding error never accumulates): pixel-aligned
+        # strips let CG skip the anti-alias coverage pass and draw crisp.
+        ppm = self._points_per_mm
+        ppp = self._pixels_per_point
+
+        def snap(v):
+            return round(v * ppp) / ppp
+
+        self._tick_xs = [snap(x0 + mm * ppm) for mm in range(RULER_LENGTH_MM + 1)]
+        self._tick_heights = [
+            TICK_LARGE_PT if mm % 10 == 0 else (TICK_MED_PT if mm % 5 == 0 else TICK_SMALL_PT)
+            for mm in range(RULER_LENGTH_MM + 1)
+        ]
+
+        # Axis-aligned rect fills rather than stroked paths: CG has a fast
+        # batched loop for rect lists and skips path flattening entirely.
+        # Each rect is the 1-pt strip the old stroke covered. One list per
+        # height class keeps the hot path free of the mm%10/mm%5 branch and
+        # gives CG uniform-height batches.
+        # Rect fills snap edges to pixel boundaries (the half-pixel offset
+        # used to center strokes does not apply to fills).
+        small_rects, med_rects, large_rects = [], [], []
+        for mm, (x, h) in enumerate(zip(self._tick_xs, self._tick_heights)):
+            rect = NSMakeRect(snap(x - 0.5), snap(y0), 1.0, h)
             if mm % 10 == 0:
-                h = TICK_LARGE_PT
+                large_rects.append(rect)
             elif mm % 5 == 0:
-                h = TICK_MED_PT
+                med_rects.append(rect)
             else:
-                h = TICK_SMALL_PT
-            path.moveToPoint_((x, y0))
-            path.lineToPoint_((x, y0 + h))
-
-        path.stroke()
-
-        # Labels (cm)
-        font = NSFont.systemFontOfSize_(12.0)
-        attrs = {
-            NSFontAttributeName: font,
-            NSForegroundColorAttributeName: NSColor.blackColor(),
-        }
-
-        for cm in range(0, (RULER_LENGTH_MM // 10) + 1):
-            x = x0 + (cm * 10) * self._points_per_mm
-            s = NSString.stringWithString_(str(cm))
-            size = s.sizeWithAttributes_(attrs)
-            s.drawAtPoint_withAttributes_((x - size.width / 2.0, y0 - size.height - 4.0), attrs)
-
-        # Optional warning
+                small_rects.append(rect)
+
+        # The horizontal baseline gets its own fill so each NSRectFillList
+        # batch stays a uniform run of 1-pt vertical strips.
+        self._baseline_rect = NSMakeRect(snap(x0), snap(y0 - 0.5), length_pt, 1.0)
+
+        self._tick_rect_lists = (small_rects, med_rects, large_rects)
+
+        # Labels (cm). The shaped strings are module constants; only their
+        # draw rects depend on the geometry.
+        labels = []
+        for cm, astr in enumerate(_CM_LABELS):
+            x = self._tick_xs[cm * 10]
+            size = astr.size()
+            rect = NSMakeRect(x - size.width / 2.0, y0 - size.height - 4.0, size.width, size.height)
+            labels.append((astr, rect))
+
+        self._cached_labels = labels
+
+        self._rebuild_warning_cache()
+
+    def _rebuild_warning_cache(self):
         if self._error_text:
-            warn_font = NSFont.systemFontOfSize_(11.0)
-            warn_attrs = {
-                NSFontAttributeName: warn_font,
-                NSForegroundColorAttributeName: NSColor.grayColor(),
-            }
-            w = NSString.stringWithString_(self._error_text)
-            w.drawAtPoint_withAttributes_((MARGIN_PT, CONTENT_H_PT - 18.0), warn_attrs)
+            self._cached_warning = NSAttributedString.alloc().initWithString_attributes_(
+                self._error_text, _WARN_ATTRS
+            )
+        else:
+            self._cached_warning = None
+
+    def drawRect_(self, dirtyRect):
+        # Fill only the dirty subrects AppKit coalesced, not their union.
+        NSColor.whiteColor().set()
+        rects, count = self.getRectsBeingDrawn_count_(None, None)
+        NSRectFillList(rects, count)
+
+        # The ruler is pre-rendered into a CGLayer; every redraw is one blit
+        # (clipped to the dirty region by CG), not a vector re-rasterization.
+        ctx = NSGraphicsContext.currentContext().CGContext()
+        if self._ruler_layer is None:
+            self._render_ruler_layer(ctx)
+        CGContextDrawLayerAtPoint(ctx, (0.0, 0.0), self._ruler_layer)
+
+    def _render_ruler_layer(self, base_ctx):
+        if self._tick_rect_lists is None:
+            self._rebuild_drawing_caches()
+
+        # The layer inherits base_ctx's device scale, so a point-sized layer
+        # stays sharp on HiDPI backing stores.
+        layer = CGLayerCreateWithContext(base_ctx, (self._content_w, CONTENT_H_PT), None)
+        layer_ctx = CGLayerGetContext(layer)
+
+        ns_ctx = NSGraphicsContext.graphicsContextWithCGContext_flipped_(layer_ctx, False)
+        NSGraphicsContext.saveGraphicsState()
+        NSGraphicsContext.setCurrentContext_(ns_ctx)
+        try:
+            NSColor.whiteColor().set()
+            NSRectFill(NSMakeRect(0, 0, self._content_w, CONTENT_H_PT))
+
+            NSColor.blackColor().set()
+            NSRectFill(self._baseline_rect)
+            for rect_list in self._tick_rect_lists:
+                NSRectFillList(rect_list, len(rect_list))
+
+            # Labels (cm)
+            for astr, rect in self._cached_labels:
+                astr.drawAtPoint_((rect.origin.x, rect.origin.y))
+
+            # Optional warning
+            if self._cached_warning is not None:
+                self._cached_warning.drawAtPoint_((MARGIN_PT, CONTENT_H_PT - 18.0))
+        finally:
+            NSGraphicsContext.restoreGraphicsState()
+
+        self._ruler_layer = layer
 
 
 class AppDelegate(NSObject):
@@ -211,30 +358,47 @@ class AppDelegate(NSObject):
         self.window.setReleasedWhenClosed_(False)
 
         self.view = RulerView.alloc().initWithFrame_(NSMakeRect(0, 0, frame.size.width, frame.size.height))
+        # Layer-backed: window moves/uncovers recomposite the cached CALayer
+        # contents without re-entering drawRect_.
+        self.view.setWantsLayer_(True)
+        self.view.setLayerContentsRedrawPolicy_(NSViewLayerContentsRedrawOnSetNeedsDisplay)
         self.window.setContentView_(self.view)
         self.window.center()
         self.window.makeKeyAndOrderFront_(None)
 
         nc = NSNotificationCenter.defaultCenter()
         nc.addObserver_selector_name_object_(
-            self, "screenParamsChanged:", NSApplicationDidChangeScreenParametersNotification, None
+            self, "screenConfigurationChanged:", NSApplicationDidChangeScreenParametersNotification, None
         )
         nc.addObserver_selector_name_object_(
-            self, "windowDidChangeScreen:", NSWindowDidChangeScreenNotification, self.window
+            self, "screenConfigurationChanged:", NSWindowDidChangeScreenNotification, self.window
         )
 
         NSApp.activateIgnoringOtherApps_(True)
 
-    def screenParamsChanged_(self, notification):
-        self.view.recomputeAndResize()
+    def _schedule_recompute(self):
+        # Screen notifications arrive in overlapping bursts (both observers can
+        # fire for one display change); coalesce to a single trailing recompute
+        # so CGDisplayCopyDisplayMode and the full invalidation run once.
+        NSObject.cancelPreviousPerformRequestsWithTarget_selector_object_(
+            self.view, "recomputeAndResize", None
+        )
+        self.view.performSelector_withObject_afterDelay_("recomputeAndResize", None, 0.05)
 
-    def windowDidChangeScreen_(self, notification):
-        self.view.recomputeAndResize()
+    def screenConfigurationChanged_(self, notification):
+        if notification.name() == NSApplicationDidChangeScreenParametersNotification:
+            # Display parameters may genuinely have changed; drop the cached
+            # probe results. A window move between known screens keeps them.
+            _DISPLAY_CACHE.clear()
+        self._schedule_recompute()
 
     def applicationShouldTerminateAfterLastWindowClosed_(self, application):
         return True
 
 if __name__ == "__main__":
+    # Deferred: only the event loop needs PyObjCTools, and only when run as an app.
+    from PyObjCTools import AppHelper
+
     app = NSApplication.sharedApplication()
     app.setActivationPolicy_(NSApplicationActivationPolicyRegular)
     install_app_menu("Ruler")